@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """Simple Pygame car racing game with keyboard controls."""
 
-import random
+import asyncio
+import numpy as np
 import pygame
 import sys
+import time
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, Tuple
+from pygame._sdl2.video import Renderer, Texture, Window
+
+try:
+    from numba import njit
+except ImportError:  # numba가 없으면 NumPy 벡터 연산 버전을 사용
+    njit = None
 
 
 @dataclass(frozen=True)
@@ -19,34 +27,92 @@ class GameConfig:
     fps: int = 60
 
 
+def _tick_obstacles_loop(obs_x, obs_y, ow, oh, speed, limit_y, px, py, pw, ph):
+    """장애물을 이동시키고 화면 안에 남은 것만 앞으로 모은 뒤 충돌 여부를 검사
+
+    장애물은 모두 ow x oh 크기이고, 배열은 제자리에서 갱신되며 (남은 장애물 수, 충돌 여부)를 반환한다.
+    numba로 컴파일해서 쓰는 버전 (일반 파이썬으로는 원소 단위 접근이 느림).
+    """
+    n_alive = 0
+    collided = False
+    for i in range(obs_y.shape[0]):
+        y = obs_y[i] + speed
+        if y > limit_y:
+            continue
+        obs_x[n_alive] = obs_x[i]
+        obs_y[n_alive] = y
+        if (abs(obs_x[n_alive] - px) * 2 < ow + pw and
+                abs(y - py) * 2 < oh + ph):
+            collided = True
+        n_alive += 1
+    return n_alive, collided
+
+
+def _tick_obstacles_vectorized(obs_x, obs_y, ow, oh, speed, limit_y, px, py, pw, ph):
+    """_tick_obstacles_loop 와 같은 동작을 NumPy 벡터 연산으로 수행 (numba가 없을 때)"""
+    obs_y += speed
+    alive = obs_y <= limit_y
+    n_alive = int(np.count_nonzero(alive))
+    if n_alive < obs_y.shape[0]:
+        obs_x[:n_alive] = obs_x[alive]
+        obs_y[:n_alive] = obs_y[alive]
+    hit = ((np.abs(obs_x[:n_alive] - px) * 2 < ow + pw) &
+           (np.abs(obs_y[:n_alive] - py) * 2 < oh + ph))
+    return n_alive, bool(hit.any())
+
+
+if njit is not None:
+    _tick_obstacles = njit(cache=True)(_tick_obstacles_loop)
+else:
+    _tick_obstacles = _tick_obstacles_vectorized
+
+
 class Car:
-    def __init__(self, x: int, y: int, width: int, height: int, color: Tuple[int, int, int]):
+    __slots__ = ('x', 'y', 'width', 'height', 'rect', 'texture',
+                 'half_width', 'half_height')
+
+    def __init__(self, x: int, y: int, width: int, height: int, texture: Texture):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.color = color
-        self.rect = pygame.Rect(x - width // 2, y - height // 2, width, height)
+        self.half_width = width // 2
+        self.half_height = height // 2
+        self.rect = pygame.Rect(x - self.half_width, y - self.half_height, width, height)
+        self.texture = texture
     
     def update(self, dx: int, dy: int = 0):
-        self.x += dx
-        self.y += dy
-        self.rect.x = self.x - self.width // 2
-        self.rect.y = self.y - self.height // 2
+        self.move_to(self.x + dx, self.y + dy)
+
+    def move_to(self, x: int, y: int):
+        self.x = x
+        self.y = y
+        self.rect.x = x - self.half_width
+        self.rect.y = y - self.half_height
     
-    def draw(self, screen: pygame.Surface):
-        pygame.draw.rect(screen, self.color, self.rect)
+    def draw(self):
+        self.texture.draw(dstrect=self.rect)
 
 
 class RacingGame:
+    _RANDOM_BATCH = 256  # 한 번에 미리 뽑아 두는 난수 개수
+
     def __init__(self, config: Optional[GameConfig] = None) -> None:
         pygame.init()
         self.config = config or GameConfig()
+        # 매 프레임 쓰이는 설정값은 한 번만 꺼내 둔다
+        self._W = self.config.width
+        self._H = self.config.height
+        self._inv_fps = 1.0 / self.config.fps
         
-        # 화면 설정
-        self.screen = pygame.display.set_mode((self.config.width, self.config.height))
-        pygame.display.set_caption("레이싱 게임")
-        self.clock = pygame.time.Clock()
+        # 화면 설정 (하드웨어 가속 렌더러, 없으면 소프트웨어 렌더러로 대체)
+        self.window = Window("레이싱 게임", size=(self.config.width, self.config.height),
+                             resizable=True)
+        # 프레임 속도는 run()의 타이머가 맞추므로 vsync로 present()를 한 번 더 막지 않는다
+        # (present()는 화면이 바뀐 프레임에만 호출되고 모니터 주사율이 fps와 다를 수도 있음)
+        self.renderer = Renderer(self.window, accelerated=-1, vsync=False)
+        # 창 크기가 바뀌어도 게임 좌표계는 그대로 두고 렌더러가 GPU에서 확대/축소
+        self.renderer.logical_size = (self.config.width, self.config.height)
         
         # 색상 정의
         self.colors = {
@@ -63,6 +129,12 @@ class RacingGame:
         self.track_left = self.config.border_x
         self.track_right = self.config.width - self.config.border_x
         self.lane_width = (self.track_right - self.track_left) / self.config.lane_count
+        self._lane_centers = tuple(int(self.track_left + self.lane_width * (lane + 0.5))
+                                   for lane in range(self.config.lane_count))
+        
+        # 차선 마커까지 그려 둔 스크롤용 도로 텍스처 (한 주기만큼 더 길게)
+        self._marker_period = self.config.lane_marker_length + self.config.lane_marker_gap
+        self._scrolling_road = Texture.from_surface(self.renderer, self._render_scrolling_road())
         
         # 게임 변수
         self.car_speed = 5
@@ -73,203 +145,268 @@ class RacingGame:
         # 플레이어 차량
         car_width = int(self.lane_width * 0.6)
         car_height = 40
-        car_x = self._lane_center(1)
+        car_x = self._lane_centers[1]
         car_y = self.config.height - 80
-        self.player_car = Car(car_x, car_y, car_width, car_height, self.colors['player_car'])
+        self.player_car = Car(car_x, car_y, car_width, car_height,
+                              self._render_box(car_width, car_height, self.colors['player_car']))
         
-        # 장애물과 차선 마커
-        self.obstacles: List[Car] = []
-        self.lane_markers: List[Tuple[int, int]] = []  # (x, y) 좌표
+        # 장애물은 모두 같은 크기와 색이므로 텍스처 하나와 Rect 하나를 재사용해 그린다
+        self._enemy_width = int(self.lane_width * 0.6)
+        self._enemy_height = 50
+        self._enemy_texture = self._render_box(self._enemy_width, self._enemy_height,
+                                               self.colors['enemy_car'])
+        self._enemy_rect = pygame.Rect(0, 0, self._enemy_width, self._enemy_height)
+        
+        # 장애물 (중심 좌표를 배열별로 저장, 크기는 모두 _enemy_width x _enemy_height)
+        # 스폰 간격이 가장 짧을 때 화면에 동시에 존재할 수 있는 최대 개수만큼 미리 할당
+        # 장애물은 y = -높이 에서 나타나 y > 화면 높이가 될 때 사라지므로 (H + 높이) 만큼 이동하고,
+        # 그동안 min_gap 간격으로 뒤따라 생긴 것들과 새로 생기는 하나가 함께 존재할 수 있다
+        min_gap = self.spawn_cooldown_range[0] * self.obstacle_speed
+        self._max_obstacles = (self.config.height + self._enemy_height) // min_gap + 1
+        self.obs_x = np.empty(self._max_obstacles, dtype=np.int32)
+        self.obs_y = np.empty(self._max_obstacles, dtype=np.int32)
+        self._n_obstacles = 0  # 배열 앞쪽 [:_n_obstacles] 만 유효
+        
+        # 첫 프레임에서 JIT 컴파일이 일어나지 않도록 미리 한 번 호출
+        if njit is not None:
+            _tick_obstacles(self.obs_x[:0], self.obs_y[:0], 0, 0, 0, 0, 0.0, 0.0, 0, 0)
+        
+        # 스폰 간격과 차선 난수는 묶음으로 미리 생성 (첫 사용 시 채워짐)
+        self._rng = np.random.default_rng()
+        self._delay_buf = np.empty(0, dtype=np.int32)
+        self._delay_idx = self._RANDOM_BATCH
+        self._lane_buf = np.empty(0, dtype=np.int32)
+        self._lane_idx = self._RANDOM_BATCH
         
         # 게임 상태
-        self.score = 0.0
         self.spawn_timer = self._next_spawn_delay()
         self.running = True
         self.game_over = False
-        
-        # 차선 마커 초기화
-        self._init_lane_markers()
+        self._frame = 0  # 진행한 프레임 수 (도로 스크롤 위치 계산용, 재시작해도 이어짐)
+        self._score_start_frame = 0  # 현재 판이 시작된 프레임 (점수 계산용)
+        self._left_down = False
+        self._right_down = False
+        self._needs_redraw = True  # 화면이 바뀌지 않은 프레임은 그리기와 present를 건너뜀
         
         # 폰트 설정
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
-
-    def _init_lane_markers(self) -> None:
-        """차선 마커 초기화"""
-        for lane in range(1, self.config.lane_count):
-            x = int(self.track_left + lane * self.lane_width)
-            for y in range(-self.config.lane_marker_length, 
-                          self.config.height + self.config.lane_marker_length, 
-                          self.config.lane_marker_length + self.config.lane_marker_gap):
-                self.lane_markers.append((x, y))
+        
+        # 텍스트 렌더링 캐시 (점수 문자열이 바뀔 때만 다시 렌더링)
+        self._score_cache: Tuple[Optional[str], Optional[Texture]] = (None, None)
+        self._game_over_text = self._render_text(self.font, "Crash!")
+        self._restart_text = self._render_text(self.small_font, "Press Enter to Resume")
+        self._game_over_rect = self._game_over_text.get_rect(
+            center=(self.config.width // 2, self.config.height // 2 - 20))
+        self._restart_rect = self._restart_text.get_rect(
+            center=(self.config.width // 2, self.config.height // 2 + 20))
 
     def handle_events(self) -> None:
         """이벤트 처리"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED):
+                self._needs_redraw = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN and self.game_over:
                     self._reset_game()
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_LEFT:
+                    self._left_down = True
+                elif event.key == pygame.K_RIGHT:
+                    self._right_down = True
+            elif event.type == pygame.KEYUP:
+                if event.key == pygame.K_LEFT:
+                    self._left_down = False
+                elif event.key == pygame.K_RIGHT:
+                    self._right_down = False
 
     def update(self) -> None:
         """게임 상태 업데이트"""
         if not self.game_over:
+            self._needs_redraw = True
             self._update_car()
-            self._update_lane_markers()
             self._update_obstacles()
             self._maybe_spawn_obstacle()
-            self._update_score()
+            self._advance_frame()
 
     def _update_car(self) -> None:
         """플레이어 차량 업데이트"""
-        keys = pygame.key.get_pressed()
+        left = self._left_down
+        right = self._right_down
         dx = 0
         
-        if keys[pygame.K_LEFT] and not keys[pygame.K_RIGHT]:
+        if left and not right:
             dx = -self.car_speed
-        elif keys[pygame.K_RIGHT] and not keys[pygame.K_LEFT]:
+        elif right and not left:
             dx = self.car_speed
 
         if dx:
-            new_x = self.player_car.x + dx
+            car = self.player_car
+            new_x = car.x + dx
             # 트랙 경계 확인
-            if (new_x - self.player_car.width // 2 >= self.track_left and 
-                new_x + self.player_car.width // 2 <= self.track_right):
-                self.player_car.update(dx)
-
-    def _update_lane_markers(self) -> None:
-        """차선 마커 업데이트"""
-        for i, (x, y) in enumerate(self.lane_markers):
-            new_y = y + self.road_scroll_speed
-            if new_y > self.config.height:
-                new_y = -self.config.lane_marker_length
-            self.lane_markers[i] = (x, new_y)
+            if (new_x - car.half_width >= self.track_left and 
+                new_x + car.half_width <= self.track_right):
+                car.update(dx)
 
     def _update_obstacles(self) -> None:
         """장애물 업데이트"""
-        obstacles_to_remove = []
+        car = self.player_car
+        n = self._n_obstacles
+        # 화면 밖으로 나간 장애물은 커널이 뒤쪽으로 밀어내므로 개수만 줄이면 된다
+        self._n_obstacles, collided = _tick_obstacles(
+            self.obs_x[:n], self.obs_y[:n], self._enemy_width, self._enemy_height,
+            self.obstacle_speed, self._H,
+            float(car.x), float(car.y), car.width, car.height)
         
-        for obstacle in self.obstacles:
-            obstacle.update(0, self.obstacle_speed)
-            
-            # 화면 밖으로 나간 장애물 제거
-            if obstacle.y > self.config.height:
-                obstacles_to_remove.append(obstacle)
-                continue
-                
-            # 충돌 검사
-            if self._check_collision(obstacle):
-                self._game_over()
-                return
-                
-        # 제거할 장애물들 삭제
-        for obstacle in obstacles_to_remove:
-            self.obstacles.remove(obstacle)
+        # 충돌 검사
+        if collided:
+            self._game_over()
 
     def _maybe_spawn_obstacle(self) -> None:
         """새 장애물 생성"""
         self.spawn_timer -= 1
+        # _max_obstacles 는 가장 짧은 스폰 간격 기준으로 잡았으므로 배열이 넘칠 일은 없다
         if self.spawn_timer <= 0:
-            lane = random.randrange(self.config.lane_count)
-            width = int(self.lane_width * 0.6)
-            height = 50
-            x = self._lane_center(lane)
-            y = -height
-            
-            obstacle = Car(x, y, width, height, self.colors['enemy_car'])
-            self.obstacles.append(obstacle)
+            lane = self._next_lane()
+            n = self._n_obstacles
+            self.obs_x[n] = self._lane_centers[lane]
+            self.obs_y[n] = -self._enemy_height
+            self._n_obstacles = n + 1
             self.spawn_timer = self._next_spawn_delay()
 
-    def _update_score(self) -> None:
-        """점수 업데이트"""
-        self.score += 1.0 / self.config.fps
+    def _advance_frame(self) -> None:
+        """프레임 카운터 증가 (점수와 도로 스크롤 위치가 여기서 계산됨)"""
+        self._frame += 1
+
+    @property
+    def score(self) -> float:
+        # 매 프레임 더하지 않고 프레임 수에서 계산해 부동소수점 오차 누적을 피함
+        return (self._frame - self._score_start_frame) * self._inv_fps
 
     def draw(self) -> None:
         """화면 그리기"""
-        # 배경 그리기
-        self.screen.fill(self.colors['background'])
-        
-        # 잔디 지역 그리기
-        pygame.draw.rect(self.screen, self.colors['grass'], 
-                        (0, 0, self.track_left, self.config.height))
-        pygame.draw.rect(self.screen, self.colors['grass'], 
-                        (self.track_right, 0, self.config.width - self.track_right, self.config.height))
-        
-        # 도로 그리기
-        pygame.draw.rect(self.screen, self.colors['road'], 
-                        (self.track_left, 0, self.track_right - self.track_left, self.config.height))
+        # 게임 오버 화면처럼 움직이는 것이 없으면 이전 프레임을 그대로 둔다
+        if not self._needs_redraw:
+            return
+        self._needs_redraw = False
         
-        # 차선 마커 그리기
-        for x, y in self.lane_markers:
-            pygame.draw.rect(self.screen, self.colors['lane_marker'], 
-                           (x - 3, y, 6, self.config.lane_marker_length))
+        # 도로 그리기 (차선 마커가 그려진 텍스처에서 화면에 보이는 부분만 잘라 한 번 그림)
+        period = self._marker_period
+        y = (self._frame * self.road_scroll_speed) % period
+        self._scrolling_road.draw(srcrect=(0, period - y, self._W, self._H),
+                                  dstrect=(0, 0, self._W, self._H))
         
         # 장애물 그리기
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
+        n = self._n_obstacles
+        texture = self._enemy_texture
+        rect = self._enemy_rect
+        half_w = self._enemy_width // 2
+        half_h = self._enemy_height // 2
+        for x, y in zip(self.obs_x[:n].tolist(), self.obs_y[:n].tolist()):
+            rect.x = x - half_w
+            rect.y = y - half_h
+            texture.draw(dstrect=rect)
         
         # 플레이어 차량 그리기
-        self.player_car.draw(self.screen)
+        self.player_car.draw()
         
         # 점수 표시
-        score_text = self.small_font.render(f"Score: {self.score:.1f}", True, self.colors['text'])
-        self.screen.blit(score_text, (10, 10))
+        score_str = f"Score: {self.score:.1f}"
+        if score_str != self._score_cache[0]:
+            self._score_cache = (score_str, self._render_text(self.small_font, score_str))
+        self._score_cache[1].draw(dstrect=(10, 10))
         
         # 게임 오버 메시지
         if self.game_over:
-            game_over_text = self.font.render("Crash!", True, self.colors['text'])
-            restart_text = self.small_font.render("Press Enter to Resume", True, self.colors['text'])
-            
-            # 텍스트 중앙 정렬
-            game_over_rect = game_over_text.get_rect(center=(self.config.width // 2, self.config.height // 2 - 20))
-            restart_rect = restart_text.get_rect(center=(self.config.width // 2, self.config.height // 2 + 20))
-            
-            self.screen.blit(game_over_text, game_over_rect)
-            self.screen.blit(restart_text, restart_rect)
+            self._game_over_text.draw(dstrect=self._game_over_rect)
+            self._restart_text.draw(dstrect=self._restart_rect)
         
-        pygame.display.flip()
+        self.renderer.present()
 
     # Helper methods ------------------------------------------------------
-    def _lane_center(self, lane: int) -> float:
-        return self.track_left + self.lane_width * (lane + 0.5)
+    def _render_scrolling_road(self) -> pygame.Surface:
+        """잔디, 도로, 차선 마커를 그린 세로 스크롤용 Surface 생성"""
+        height = self.config.height + self._marker_period
+        road = pygame.Surface((self.config.width, height))
+        road.fill(self.colors['background'])
+        pygame.draw.rect(road, self.colors['grass'], 
+                        (0, 0, self.track_left, height))
+        pygame.draw.rect(road, self.colors['grass'], 
+                        (self.track_right, 0, self.config.width - self.track_right, height))
+        pygame.draw.rect(road, self.colors['road'], 
+                        (self.track_left, 0, self.track_right - self.track_left, height))
+        for lane in range(1, self.config.lane_count):
+            x = int(self.track_left + lane * self.lane_width)
+            for y in range(0, height, self._marker_period):
+                pygame.draw.rect(road, self.colors['lane_marker'], 
+                               (x - 3, y, 6, self.config.lane_marker_length))
+        return road
+
+    def _render_box(self, width: int, height: int, color: Tuple[int, int, int]) -> Texture:
+        surf = pygame.Surface((width, height))
+        surf.fill(color)
+        return Texture.from_surface(self.renderer, surf)
+
+    def _render_text(self, font: pygame.font.Font, text: str) -> Texture:
+        return Texture.from_surface(self.renderer, font.render(text, True, self.colors['text']))
 
     def _next_spawn_delay(self) -> int:
-        return random.randint(*self.spawn_cooldown_range)
+        if self._delay_idx >= self._RANDOM_BATCH:
+            self._delay_buf = self._rng.integers(*self.spawn_cooldown_range, self._RANDOM_BATCH,
+                                                 dtype=np.int32, endpoint=True)
+            self._delay_idx = 0
+        delay = int(self._delay_buf[self._delay_idx])
+        self._delay_idx += 1
+        return delay
 
-    def _check_collision(self, obstacle: Car) -> bool:
-        return self.player_car.rect.colliderect(obstacle.rect)
+    def _next_lane(self) -> int:
+        if self._lane_idx >= self._RANDOM_BATCH:
+            self._lane_buf = self._rng.integers(0, self.config.lane_count, self._RANDOM_BATCH,
+                                                dtype=np.int32)
+            self._lane_idx = 0
+        lane = int(self._lane_buf[self._lane_idx])
+        self._lane_idx += 1
+        return lane
 
     def _game_over(self) -> None:
         self.game_over = True
 
     def _reset_game(self) -> None:
         self.game_over = False
-        self.obstacles.clear()
-        self.score = 0.0
+        self._needs_redraw = True
+        self._n_obstacles = 0
+        # 도로는 끊김 없이 계속 흐르도록 프레임 수는 두고 점수 기준점만 옮긴다
+        self._score_start_frame = self._frame
         self.spawn_timer = self._next_spawn_delay()
         
         # 플레이어 차량을 중앙으로 리셋
-        car_x = self._lane_center(1)
-        car_y = self.config.height - 80
-        self.player_car.x = car_x
-        self.player_car.y = car_y
-        self.player_car.rect.x = car_x - self.player_car.width // 2
-        self.player_car.rect.y = car_y - self.player_car.height // 2
+        self.player_car.move_to(self._lane_centers[1], self.config.height - 80)
 
-    def run(self) -> None:
+    async def run(self) -> None:
         """메인 게임 루프"""
+        period = self._inv_fps
+        # perf_counter는 해상도가 높아 16.7ms 프레임 간격을 재기에 충분하다
+        next_t = time.perf_counter()
         while self.running:
             self.handle_events()
             self.update()
             self.draw()
-            self.clock.tick(self.config.fps)
+            
+            # 다음 프레임 시각까지 대기 (그동안 다른 asyncio 작업이 실행될 수 있음)
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay < 0:
+                # 프레임이 밀렸으면 따라잡으려 하지 않고 현재 시각 기준으로 다시 맞춤
+                next_t -= delay
+                delay = 0
+            await asyncio.sleep(delay)
         
         pygame.quit()
         sys.exit()
 
 
 if __name__ == "__main__":
-    RacingGame().run()
+    asyncio.run(RacingGame().run())